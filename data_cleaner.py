@@ -1,13 +1,46 @@
 from __future__ import annotations
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field, fields
+from functools import lru_cache, partial
+from itertools import chain, compress
+import numpy as np
 import pandas as pd
+from pandas.io.parsers import TextFileReader
 import json
+import hashlib
+import os
+import shutil
 from pathlib import Path
-from ydata_profiling import ProfileReport
+from ydata_profiling import ProfileReport, __version__ as profiler_version
 
 import logging.handlers
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa = None
+
 LOG_BACKUPS = 3
-BASE_DIR = Path(__name__).parent
+BASE_DIR = Path(__file__).resolve().parent
+PROFILE_CACHE_DIR = BASE_DIR / ".profile_cache"
+# cached profiles kept, the least recently used are removed
+PROFILE_CACHE_SIZE = 16
+# changes with any change to the cleaning code, invalidating its profiles
+CODE_VERSION = hashlib.blake2b(
+    Path(__file__).read_bytes(),
+    digest_size=8
+).hexdigest()
+# maximum ratio of distinct values to rows for category text columns
+CATEGORY_MAX_RATIO = 0.5
+# output delimiters handled by the pyarrow CSV writer
+ARROW_DELIMITERS = (",", "\t")
 
 DEFAULT_CFG = {
     "input_file": "data/my_data.csv",  # done
@@ -30,10 +63,74 @@ DEFAULT_CFG = {
     "datetime_col": ["Order Date"],  # done
     "datetime_format": ["%m/%d/%y %H:%M"],  # done
     "drop_col": [],  # done
-    "quantile_ouliers_col": []  # done ?
+    "quantile_ouliers_col": [],  # done ?
+    "stream_chunks": False,
+    "chunksize": 500_000,
+    "csv_engine": "pyarrow",
+    "arrow_writer": False,
+    "profile_minimal": True,
+    "profile_correlations": False,
+    "fast_dedup": True,
+    "str_as_category": True
 }
 
 
+@dataclass(slots=True, frozen=True)
+class Spec:
+    """ Read-only, typed specs options.
+
+    Options missing from a specs file are assumed false or empty, the
+    performance options take their default values.
+    """
+    input_file: str = ""
+    output_file: str = ""
+    delimiter_in: str = ","
+    delimiter_out: str = ","
+    input_file_profile: str = ""
+    output_file_profile: str = ""
+    summary_file: str = ""
+    drop_repeat_headers: bool = False
+    drop_duplicates: bool = False
+    drop_na: bool = False
+    clean_types: bool = False
+    export_output_file: bool = False
+    str_col: list[str] = field(default_factory=list)
+    float_col: list[str] = field(default_factory=list)
+    int_col: list[str] = field(default_factory=list)
+    numeric_col: list[str] = field(default_factory=list)
+    datetime_col: list[str] = field(default_factory=list)
+    datetime_format: list[str] = field(default_factory=list)
+    drop_col: list[str] = field(default_factory=list)
+    quantile_ouliers_col: list[str] = field(default_factory=list)
+    stream_chunks: bool = False
+    chunksize: int = DEFAULT_CFG["chunksize"]
+    csv_engine: str = DEFAULT_CFG["csv_engine"]
+    arrow_writer: bool = False
+    profile_minimal: bool = DEFAULT_CFG["profile_minimal"]
+    profile_correlations: bool = False
+    fast_dedup: bool = DEFAULT_CFG["fast_dedup"]
+    str_as_category: bool = DEFAULT_CFG["str_as_category"]
+
+
+def json_loads(text: str | bytes):
+    """ Parses JSON text, using orjson if available.
+
+    Raises:
+        json.JSONDecodeError: if the text is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def json_dumps(obj) -> str:
+    """ Serializes an object to indented JSON text, using orjson if available.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
+
 class CleanerCSV:
     """ Data processing class.
 
@@ -56,45 +153,63 @@ class CleanerCSV:
             self.logfile, logging.DEBUG
         )
         self.logger.addHandler(self.log_handler)
+        self.user_log_handler = None
 
+        # the logger is shared, a failed instance must not keep its handlers
         try:
-            with open(
-                    config_file,
-                    encoding="utf-8"
-            ) as f:
-                self.cfg = json.load(f)
+            try:
+                cfg = CleanerCSV.load_config(config_file)
                 self.cfg_file = config_file
-        except FileNotFoundError:
-            self.cfg = CleanerCSV.create_default_config()
-            self.cfg_file = (BASE_DIR / "default_specs.json").absolute()
-            self.logger.warning(f"config not found {config_file!r} "
-                                f"- loading default config instead")
-        except json.JSONDecodeError as e:
-            self.cfg = CleanerCSV.create_default_config()
-            self.cfg_file = (BASE_DIR / "default_specs.json").absolute()
-            self.logger.warning(
-                f"config file {config_file!r} is not valid JSON - {e} - "
-                f"laoding default config instead")
-        self.logger.info(f"loaded config {self.cfg_file!r}")
-        user_log = self.cfg.get("summary_file", None)
-        if user_log:
-            user_log = BASE_DIR / user_log
-            if user_log != self.logfile:
-                self.logger.addHandler(
-                    CleanerCSV.make_log_handler(user_log, logging.INFO)
-                )
-
-        self.input_profile = BASE_DIR / self.cfg.get("input_file_profile")
-        self.output_profile = BASE_DIR / self.cfg.get("output_file_profile")
-        self.df = self.csv_read()
+            except FileNotFoundError:
+                cfg = CleanerCSV.create_default_config()
+                self.cfg_file = BASE_DIR / "default_specs.json"
+                self.logger.warning(f"config not found {config_file!r} "
+                                    f"- loading default config instead")
+            except json.JSONDecodeError as e:
+                cfg = CleanerCSV.create_default_config()
+                self.cfg_file = BASE_DIR / "default_specs.json"
+                self.logger.warning(
+                    f"config file {config_file!r} is not valid JSON - {e} - "
+                    f"laoding default config instead")
+            self.logger.info(f"loaded config {self.cfg_file!r}")
+            options = {f.name for f in fields(Spec)}
+            unknown = [key for key in cfg if key not in options]
+            if unknown:
+                self.logger.warning(f"ignoring unknown spec options {unknown}")
+            self.spec = Spec(
+                **{key: value for key, value in cfg.items() if key in options}
+            )
+            user_log = self.spec.summary_file
+            if user_log:
+                user_log = BASE_DIR / user_log
+                if user_log != self.logfile:
+                    self.user_log_handler = CleanerCSV.make_log_handler(
+                        user_log, logging.INFO
+                    )
+                    self.logger.addHandler(self.user_log_handler)
+
+            self.input_profile = BASE_DIR / self.spec.input_file_profile
+            self.output_profile = BASE_DIR / self.spec.output_file_profile
+            self.reader = None
+            self.chunks = None
+            self.df = self.csv_read()
+            if isinstance(self.df, TextFileReader):
+                self.reader, self.df = self.df, None
+        except BaseException:
+            self.release_files()
+            raise
         self.df_changed = False
+        # number of cleaning operations run on the dataframe
+        self._ops_ran = 0
         self.na_safe = False
 
     def release_files(self):
         """ Closes and releases the logger ressources.
         """
-        self.log_handler.close()
-        self.logger.removeHandler(self.log_handler)
+        for handler in (self.log_handler, self.user_log_handler):
+            if handler is not None:
+                handler.close()
+                self.logger.removeHandler(handler)
 
     @classmethod
     def create_default_config(cls) -> dict:
@@ -108,9 +223,7 @@ class CleanerCSV:
         """
         default_cfg_file = BASE_DIR / "default_specs.json"
         if default_cfg_file.exists():
-            with open(default_cfg_file, encoding="utf-8") as f:
-                cfg = json.load(f)
-                return cfg
+            return cls.load_config(default_cfg_file)
 
         # write fallback default config dict
         default = DEFAULT_CFG
@@ -119,10 +232,35 @@ class CleanerCSV:
                 mode="w",
                 encoding="utf-8"
         ) as f:
-            json.dump(default, f, indent=4, ensure_ascii=False)
+            f.write(json_dumps(default))
 
         return default
 
+    @classmethod
+    def load_config(cls, config_file: Path) -> dict:
+        """ Reads a specs file.
+
+        The parsed content is reused for as long as the file is unchanged.
+
+        Args:
+            config_file (Path): The specs file to read
+        Returns:
+            dict: The specs as a dict.
+        Raises:
+            FileNotFoundError: if the file does not exist
+            json.JSONDecodeError: if the file is not valid JSON
+        """
+        stat = config_file.stat()
+        return dict(cls._load_cfg(config_file, stat.st_mtime_ns, stat.st_size))
+
+    @classmethod
+    @lru_cache(maxsize=4)
+    def _load_cfg(cls, config_file: Path, mtime_ns: int, size: int) -> dict:
+        """ Parses a specs file, cached by its path, mtime and size.
+        """
+        with open(config_file, encoding="utf-8") as f:
+            return json_loads(f.read())
+
     @classmethod
     def make_log_handler(
             cls,
@@ -154,17 +292,59 @@ class CleanerCSV:
 
         return fh
 
-    def csv_read(self) -> pd.DataFrame:
+    def csv_read(self) -> pd.DataFrame | TextFileReader:
         """ Read the specified csv file into a dataframe
+
+        If the spec enables "stream_chunks" a reader yielding dataframes of
+        "chunksize" rows is returned instead.
         """
-        source_path = self.local_path / self.cfg.get("input_file")
-        sep = self.cfg.get("delimiter_in")
+        source_path = self.local_path / self.spec.input_file
+        sep = self.spec.delimiter_in
         sep = sep if sep else ","
+        engine = self.spec.csv_engine
+        # the c parser only splits on single characters, pandas' python
+        # parser takes the longer and regex separators
+        fallback = "c" if len(sep) == 1 else "python"
+        chunksize = None
+        read_options = {}
+        if self.spec.stream_chunks:
+            chunksize = self.spec.chunksize or DEFAULT_CFG["chunksize"]
+            # the pyarrow parser does not support reading in chunks
+            engine = fallback
+            # dtypes inferred per chunk differ between chunks, text keeps
+            # the row hashes and conversions alike in every chunk
+            read_options["dtype"] = str
+        # the c parser maps the file into memory instead of reading it
+        # through small buffered reads
+        c_options = {"memory_map": True}
+        if chunksize is None:
+            c_options["low_memory"] = False
         try:
-            df_source = pd.read_csv(
-                source_path,
-                sep=sep
-            )
+            try:
+                df_source = pd.read_csv(
+                    source_path,
+                    sep=sep,
+                    engine=engine,
+                    chunksize=chunksize,
+                    **read_options,
+                    **(c_options if engine == "c" else {})
+                )
+            except (ImportError, ValueError) as e:
+                # pyarrow is missing or refuses dirty input, such as short
+                # rows or long separators, which the fallback handles
+                if engine == fallback:
+                    raise
+                self.logger.warning(
+                    f"CSV engine {engine!r} failed - {e} - "
+                    f"falling back to {fallback!r}")
+                df_source = pd.read_csv(
+                    source_path,
+                    sep=sep,
+                    engine=fallback,
+                    chunksize=chunksize,
+                    **read_options,
+                    **(c_options if fallback == "c" else {})
+                )
         except IOError as e:
             self.logger.error(f"failed to read CSV: {e}")
             raise e
@@ -174,38 +354,118 @@ class CleanerCSV:
 
     def csv_write_clean(self):
         """ Writes the (cleaned) dataframe to a CSV file
+
+        Streamed data is written chunk by chunk into the same file. Uses the
+        pyarrow CSV writer if the spec enables "arrow_writer", pandas
+        otherwise.
         """
-        if not self.cfg.get("export_output_file"):
+        if not self.spec.export_output_file:
             self.logger.warning(
                 f"the specs file \"export_output_file\" is 'False' - "
                 f"cleaned data was not stored")
             return
 
-        file_out = self.local_path / self.cfg.get("output_file")
+        file_out = self.local_path / self.spec.output_file
         file_out.parent.mkdir(parents=True, exist_ok=True)
-        sep = self.cfg.get("delimiter_out")
+        sep = self.spec.delimiter_out
         sep = sep if sep else ","
+        if self.chunks is not None:
+            frames = self.chunks
+        elif self.reader is not None:
+            frames = self.reader
+        else:
+            frames = (self.df,)
+        # consumed streams yield nothing, keep the file written before
+        frames = iter(frames)
+        first = next(frames, None)
+        if first is None:
+            self.logger.error(
+                f"no data left to write - the streamed data has already "
+                f"been written to {file_out!r}")
+            return
+        frames = chain((first,), frames)
+        # the pyarrow output is formatted differently, streamed data is
+        # always written by pandas so a file never mixes both formats
+        use_arrow = (
+            self.spec.arrow_writer
+            and pa is not None
+            and sep in ARROW_DELIMITERS
+            and self.chunks is None
+            and self.reader is None
+        )
         try:
-            self.df.to_csv(
-                file_out,
-                sep=sep,
-                index=False
-            )
+            with open(file_out, mode="wb") as f:
+                if use_arrow and self.csv_write_arrow(f, sep):
+                    frames = ()
+                for i, frame in enumerate(frames):
+                    frame.to_csv(
+                        f,
+                        mode="wb",
+                        encoding="utf-8",
+                        sep=sep,
+                        header=i == 0,
+                        index=False
+                    )
         except IOError as e:
             self.logger.error(f"failed to write CSV: {e}")
             raise e
         else:
             self.logger.info(f"processed data written to {file_out!r}")
 
+    def csv_write_arrow(self, f, sep: str) -> bool:
+        """ Writes the dataframe to an open CSV file using pyarrow.
+
+        Datetimes are written with second precision, like pandas does for
+        data without fractions of seconds. Data which pyarrow can not
+        write, including datetimes with fractions of seconds, is left to
+        pandas.
+
+        Args:
+            f: The binary file to write to
+            sep: The delimiter to use
+
+        Returns:
+            bool: True if the data was written
+        """
+        try:
+            table = pa.Table.from_pandas(self.df, preserve_index=False)
+            table = table.cast(pa.schema([
+                column.with_type(pa.timestamp("s", column.type.tz))
+                if pa.types.is_timestamp(column.type) else column
+                for column in table.schema
+            ]))
+            pa_csv.write_csv(
+                table,
+                f,
+                write_options=pa_csv.WriteOptions(
+                    delimiter=sep,
+                    batch_size=64_000
+                )
+            )
+        except pa.ArrowException as e:
+            self.logger.warning(
+                f"pyarrow can not write the data - {e} - "
+                f"writing with pandas instead")
+            f.seek(0)
+            f.truncate()
+            return False
+        return True
+
     def html_profile(self) -> str:
         """ Creates and writes a profile for the dataframe
 
         Will automatically choose to write input profile if the data has not
         been changed and output profile as soon as any cleaning operation
         has been run.
+        Profiles are reused from the profile cache, the output is profiled
+        like the source data if the cleaning pass did not run any operation.
         """
+        if self.reader is not None:
+            self.logger.warning("streamed data can not be profiled")
+            return ""
+
         if not self.df_changed:
-            file = self.cfg.get("input_file_profile")
+            file = self.spec.input_file_profile
             if file:
                 file = self.local_path / file
                 self.logger.info(f"profiling source data to {file!r}")
@@ -213,7 +473,7 @@ class CleanerCSV:
                 self.logger.warning(f"no file selected for input profile")
                 return file
         else:
-            file = self.cfg.get("output_file_profile")
+            file = self.spec.output_file_profile
             if file:
                 file = self.local_path / file
                 self.logger.info(f"cleaned data - profiling to {file!r}")
@@ -222,142 +482,414 @@ class CleanerCSV:
                 return file
 
         file.parent.mkdir(parents=True, exist_ok=True)
-        profile = ProfileReport(self.df)
+        cached = self.profile_cache_file()
+        if CleanerCSV.is_newer(cached, self.local_path / self.spec.input_file):
+            shutil.copyfile(cached, file)
+            # mark as recently used, keeping it from eviction
+            os.utime(cached)
+            self.logger.info(f"reusing cached profile {cached!r}")
+            return file.__str__()
+
+        # the profiler relabels the columns of its input in place, a shallow
+        # copy keeps the labels of the frame other threads may be reading
+        profile = ProfileReport(
+            self.df.copy(deep=False),
+            progress_bar=False,
+            **self.profile_options()
+        )
         profile.to_file(output_file=file)
+        PROFILE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(file, cached)
+        CleanerCSV.evict_profiles(PROFILE_CACHE_SIZE)
         self.logger.info(f"profiling finished")
 
         return file.__str__()
 
-    def run_all_cleaners(self) -> pd.DataFrame:
+    @classmethod
+    def is_newer(cls, file: Path, *sources: Path) -> bool:
+        """ Checks if a file exists and was modified after all the sources.
+        """
+        try:
+            mtime = file.stat().st_mtime_ns
+            return all(mtime > source.stat().st_mtime_ns for source in sources)
+        except OSError:
+            return False
+
+    def profile_options(self) -> dict:
+        """ Collects the ProfileReport settings from the spec.
+
+        Correlations and interactions scale with the square of the column
+        count and are disabled unless the spec asks for them. They are
+        then enabled explicitly, as the minimal settings turn them off.
+
+        Returns:
+            dict: Keyword arguments for ProfileReport
+        """
+        options = {"minimal": self.spec.profile_minimal}
+        if self.spec.profile_correlations:
+            options["correlations"] = {"auto": {"calculate": True}}
+            options["interactions"] = {"continuous": True}
+        else:
+            options["correlations"] = None
+            options["interactions"] = None
+
+        return options
+
+    def profile_cache_file(self) -> Path:
+        """ Locates the cached profile for the current dataframe.
+
+        Profiles are cached by the source file path, size and modification
+        time, the profiler version and the spec options affecting the
+        profile - the read and profile settings for source data, all
+        options, the cleaning code version and the number of operations
+        run once the data has been cleaned.
+
+        Returns:
+            Path: The cache file, which might not exist yet
+        """
+        source = (self.local_path / self.spec.input_file).resolve()
+        source_stat = source.stat()
+        # data no cleaning operation ran on shares the source profile
+        changed = self.df_changed and self._ops_ran > 0
+        if changed:
+            options = json.dumps(asdict(self.spec), sort_keys=True)
+            options = f"{CODE_VERSION}:{options}"
+        else:
+            # the read options shape the source dataframe
+            options = json.dumps({
+                **self.profile_options(),
+                "delimiter_in": self.spec.delimiter_in,
+                "csv_engine": self.spec.csv_engine
+            }, sort_keys=True)
+        key = hashlib.blake2b(
+            f"{source}:{source_stat.st_mtime_ns}:{source_stat.st_size}:"
+            f"{profiler_version}:{options}:"
+            f"{'out' if changed else 'in'}:{self._ops_ran}".encode(),
+            digest_size=16
+        )
+        return PROFILE_CACHE_DIR / f"{key.hexdigest()}.html"
+
+    @classmethod
+    def evict_profiles(cls, keep: int):
+        """ Removes all but the most recently used cached profiles.
+
+        Args:
+            keep: Number of cached profiles to keep
+        """
+        cached = sorted(
+            PROFILE_CACHE_DIR.glob("*.html"),
+            key=lambda f: f.stat().st_mtime_ns,
+            reverse=True
+        )
+        for file in cached[keep:]:
+            file.unlink(missing_ok=True)
+
+    def run_all_cleaners(self) -> pd.DataFrame | Iterator[pd.DataFrame]:
         """ Calls each cleaning method in turn.
 
         Each cleaner reads and respects the relevant specs options.
+        Streamed data is cleaned lazily, chunk by chunk, as the returned
+        iterator is consumed (usually by csv_write_clean).
         """
+        if self.reader is not None:
+            if self.chunks is not None:
+                # a previous pass has consumed the reader, read anew
+                self.reader.close()
+                self.reader = self.csv_read()
+            if self.spec.quantile_ouliers_col:
+                self.logger.warning(
+                    "IQR cleaning requires the whole dataframe "
+                    "- skipping IQR step for streamed data")
+            self.chunks = self.clean_chunks()
+            return self.chunks
+
         self.clean_headers()
         self.clean_drop_dupplicates()
-        self.clean_numeric_columns()
-        self.clean_datetime_columns()
-        self.run_astype_conversion("int")
-        self.run_astype_conversion("float")
-        self.run_astype_conversion("str")
+        self._fused_type_pass()
         self.clean_drop_na()
         self.drop_columns()
         self.clean_quantile_outliers()
+        # the next profile describes the output, even if nothing ran
+        self.df_changed = True
 
         return self.df
 
+    def clean_chunks(self) -> Iterator[pd.DataFrame]:
+        """ Runs the row-wise cleaners on each chunk of the streamed data.
+
+        Duplicates are tracked across chunks by row hashes, keeping the
+        first occurrence of a row.
+        """
+        seen = set()
+        for chunk in self.reader:
+            self.df = chunk
+            self.clean_headers()
+            self.clean_drop_dupplicates(seen)
+            self._fused_type_pass()
+            self.clean_drop_na()
+            self.drop_columns()
+            yield self.df
+
     def clean_headers(self):
         """ Removes re-occuring header rows.
         """
-        if self.cfg.get("drop_repeat_headers"):
-            self.logger.info("removing dupplicate headers")
-            self.df_changed = True
-            self.df.drop(
-                self.df.loc[
-                    self.df.eq(self.df.columns).any(axis=1)
-                ].index,
-                inplace=True
+        if not self.spec.drop_repeat_headers:
+            return
+
+        # only text columns can hold a copy of their header label
+        text_cols = self.df.select_dtypes(include=["object", "string"]).columns
+        if text_cols.empty:
+            return
+
+        self.logger.info("removing dupplicate headers")
+        self.df_changed = True
+        self._ops_ran += 1
+        is_header = np.zeros(len(self.df), dtype=bool)
+        for col in text_cols:
+            np.logical_or(
+                is_header,
+                (self.df[col] == col).to_numpy(dtype=bool, na_value=False),
+                out=is_header
             )
+        self.df.drop(self.df.index[is_header], inplace=True)
 
-    def clean_drop_dupplicates(self):
+    def clean_drop_dupplicates(self, seen: set | None = None):
         """ Remove dupplicate data rows.
-        """
-        if self.cfg.get("drop_duplicates"):
-            self.logger.info("removing dupplicate rows")
-            self.df_changed = True
-            self.df.drop_duplicates(keep="last", inplace=True)
 
-    def clean_numeric_columns(self):
-        """ Defines numeric column data types.
+        Args:
+            seen (set): Row hashes of previously processed chunks, when
+                streaming. Matching rows are dropped and the hashes of the
+                kept rows are added.
         """
-        if not self.cfg.get("clean_types"):
+        if not self.spec.drop_duplicates:
             return
 
+        self.logger.info("removing dupplicate rows")
         self.df_changed = True
-        for col in self.cfg.get("numeric_col"):
-            self.logger.info(f"running to_numeric on column {col!r}")
-            self.df[col] = pd.to_numeric(self.df[col], errors="coerce")
+        self._ops_ran += 1
+        if seen is None and not self.spec.fast_dedup:
+            self.df.drop_duplicates(keep="last", inplace=True)
+            return
+        if seen is None:
+            # positions of the last occurrence of every distinct row hash
+            hashes = pd.util.hash_pandas_object(self.df, index=False)
+            hashes = hashes.to_numpy()[::-1]
+            _, last = np.unique(hashes, return_index=True)
+            self.df = self.df.take(np.sort(len(hashes) - 1 - last))
+            return
 
-    def run_astype_conversion(self, type_str: str):
-        """ Runs explicit astype conversions.
+        hashes = pd.util.hash_pandas_object(self.df, index=False)
+        values = hashes.to_numpy().tolist()
+        # look the chunk's hashes up in the set, isin would convert the
+        # whole, ever growing set into an array for every chunk
+        known = np.fromiter(map(seen.__contains__, values), bool, len(values))
+        keep = ~(hashes.duplicated(keep="first").to_numpy() | known)
+        seen.update(compress(values, keep))
+        self.df.drop(self.df.index[~keep], inplace=True)
+
+    def _fused_type_pass(self):
+        """ Defines column data types in a single pass.
+
+        The numeric and datetime conversions are assigned to the dataframe
+        at once, followed by one astype call for the explicit types,
+        instead of rewriting the dataframe for every column.
         """
-        if not self.cfg.get("clean_types"):
+        if not self.spec.clean_types:
             return
 
-        match type_str:
-            case "int":
-                cols_choice = self.cfg.get("int_col")
-            case "float":
-                cols_choice = self.cfg.get("float_col")
-            case "str":
-                cols_choice = self.cfg.get("str_col")
-            case _:
-                return
-        if not cols_choice:
+        converted = CleanerCSV._convert_columns({
+            **self._numeric_conversions(),
+            **self._datetime_conversions()
+        })
+        if converted:
+            self.df_changed = True
+            self._ops_ran += 1
+            self.df = self.df.assign(**converted)
+
+        astype_map = self._astype_map()
+        if not astype_map:
             return
 
         self.df_changed = True
-        type_map = {"int": int, "float": float, "str": str}
-        for col in cols_choice:
-            self.logger.info(f"running astype({type_str!r}) on column {col!r}")
-            try:
-                self.df[col] = self.df[col].astype(
-                    type_map.get(type_str, str)
-                )
-            except ValueError as e:
-                self.logger.error(
-                    f"converting column {col} to {type_str!r} failed - {e}"
-                )
-            except KeyError as e:
+        self._ops_ran += 1
+        # int_col cuts off fractions, as astype(int) did, Int64 would refuse
+        # them but keeps missing values
+        truncated = {
+            col: np.trunc(self.df[col])
+            for col, dtype in astype_map.items()
+            if dtype == "Int64" and pd.api.types.is_float_dtype(self.df[col])
+        }
+        if truncated:
+            self.df = self.df.assign(**truncated)
+        try:
+            self.df = self.df.astype(astype_map)
+        except (ValueError, TypeError):
+            # retry column by column to keep the convertible ones
+            for col, dtype in astype_map.items():
+                try:
+                    self.df[col] = self.df[col].astype(dtype)
+                except (ValueError, TypeError) as e:
+                    self.logger.error(
+                        f"converting column {col} to {dtype!r} failed - {e}"
+                    )
+
+    @classmethod
+    def _convert_columns(cls, conversions: dict[str, Callable]) -> dict:
+        """ Runs the column conversions in a thread pool.
+
+        The pandas parsers spend most of their time in compiled code, so
+        independent columns convert in parallel.
+
+        Args:
+            conversions (dict): Conversion callables by column name
+        Returns:
+            dict: The converted columns by column name
+        """
+        if len(conversions) < 2:
+            return {col: convert() for col, convert in conversions.items()}
+
+        workers = min(len(conversions), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(
+                lambda convert: convert(), conversions.values()
+            )
+            return dict(zip(conversions, results))
+
+    def _numeric_conversions(self) -> dict[str, Callable]:
+        """ Prepares the numeric column conversions.
+
+        Returns:
+            dict: The conversion callables by column name
+        """
+        conversions = {}
+        # a chunk without missing values would come out as integers, chunks
+        # share one type so the output column is written alike
+        to_numeric = (
+            CleanerCSV._to_float if self.reader is not None else pd.to_numeric
+        )
+        for col in self.spec.numeric_col or []:
+            if col not in self.df.columns:
                 self.logger.warning(
-                    f"column {col} (to {type_str!r}) not in the dataframe "
-                    f"- {e}"
-                )
+                    f"column {col} (to numeric) not in the dataframe")
+                continue
+            self.logger.info(f"running to_numeric on column {col!r}")
+            conversions[col] = partial(
+                to_numeric, self.df[col], errors="coerce"
+            )
 
-    def clean_datetime_columns(self):
-        """ Defines datetime column data types.
+        return conversions
+
+    @staticmethod
+    def _to_float(values: pd.Series, errors: str) -> pd.Series:
+        """ Converts values to numbers, always of the float64 type.
         """
-        cols = self.cfg.get("datetime_col")
-        if not self.cfg.get("clean_types") or not cols:
-            return
+        return pd.to_numeric(values, errors=errors).astype("float64")
 
-        forms = self.cfg.get("datetime_format")
+    def _datetime_conversions(self) -> dict[str, Callable]:
+        """ Prepares the datetime column conversions.
+
+        Returns:
+            dict: The conversion callables by column name
+        """
+        cols = self.spec.datetime_col
+        if not cols:
+            return {}
+
+        forms = self.spec.datetime_format or []
         l_cols = len(cols)
         l_forms = len(forms)
         if l_cols != l_forms:
             self.logger.warning(
                 f"spec has {l_cols!r} datetime columns but {l_forms!r} formats"
                 f" - skipping datetime step")
-            return self.df
+            return {}
 
-        self.df_changed = True
+        conversions = {}
         for col, form in zip(cols, forms):
+            if col not in self.df.columns:
+                self.logger.warning(
+                    f"column {col} (to datetime) not in the dataframe")
+                continue
+            # without an explicit format the column is parsed as ISO 8601
+            form = form or "ISO8601"
             self.logger.info(
                 f"running to_datetime on column {col!r} using {form!r}"
             )
-            self.df[col] = pd.to_datetime(
+            # cache: repeated date strings are parsed only once
+            conversions[col] = partial(
+                pd.to_datetime,
                 self.df[col],
                 format=form,
-                errors="coerce"
+                errors="coerce",
+                cache=True,
+                exact=True
             )
 
+        return conversions
+
+    def _astype_map(self) -> dict:
+        """ Collects the explicit astype conversions.
+
+        Returns:
+            dict: The target dtype by column name
+        """
+        type_map = {
+            "int": ("Int64", self.spec.int_col),
+            "float": ("float64", self.spec.float_col),
+            "str": ("string", self.spec.str_col)
+        }
+        astype_map = {}
+        for type_str, (dtype, cols) in type_map.items():
+            for col in cols or []:
+                if col not in self.df.columns:
+                    self.logger.warning(
+                        f"column {col} (to {type_str!r}) not in the dataframe"
+                    )
+                    continue
+                if type_str == "str" and self._is_categorical(col):
+                    self.logger.info(
+                        f"running astype('category') on column {col!r}"
+                    )
+                    astype_map[col] = "category"
+                    continue
+                self.logger.info(
+                    f"running astype({type_str!r}) on column {col!r}"
+                )
+                astype_map[col] = dtype
+
+        return astype_map
+
+    def _is_categorical(self, col: str) -> bool:
+        """ Checks if a text column is better stored as a category.
+
+        Text columns with few distinct values are held as integer codes
+        plus a small set of categories, if the spec enables
+        "str_as_category".
+        """
+        if not self.spec.str_as_category or not len(self.df):
+            return False
+        ratio = self.df[col].nunique() / len(self.df)
+        return ratio < CATEGORY_MAX_RATIO
+
     def clean_drop_na(self):
         """ Removes rows containing NaN entries.
         """
-        if not self.cfg.get("drop_na"):
+        if not self.spec.drop_na:
             return
 
         self.logger.info("dropping NaN and NaT rows")
         self.df_changed = True
+        self._ops_ran += 1
         self.df.dropna(axis="index", how="all", inplace=True)
 
     def clean_quantile_outliers(self):
         """ Clears outliers using IQR
         """
-        q_o_cols = self.cfg.get("quantile_ouliers_col")
+        q_o_cols = self.spec.quantile_ouliers_col
         if not q_o_cols:
             return
 
+        cols = []
         for col in q_o_cols:
             if not pd.api.types.is_numeric_dtype(self.df[col]):
                 self.logger.warning(
@@ -365,38 +897,46 @@ class CleanerCSV:
                     f"- skipping IQR cleaning "
                 )
                 continue
+            cols.append(col)
+        if not cols:
+            return
 
-            self.logger.info(f"running IQR cleaner on column {col}.")
-            q1 = self.df[col].quantile(0.25)
-            q3 = self.df[col].quantile(0.75)
-            iqr = q1 - q3
-            min_valid = q1 - 1.5 * iqr
-            max_valid = q3 + 1.5 * iqr
-
-            valid_rows = (
-                    (self.df[col] >= min_valid) &
-                    (self.df[col] <= max_valid)
-            )
-
-            self.df = self.df[valid_rows]
+        self.logger.info(f"running IQR cleaner on columns {cols}.")
+        self.df_changed = True
+        self._ops_ran += 1
+        values = self.df[cols].to_numpy(dtype="float64", na_value=np.nan)
+        q1, q3 = np.nanquantile(values, [0.25, 0.75], axis=0)
+        iqr = q3 - q1
+        min_valid = q1 - 1.5 * iqr
+        max_valid = q3 + 1.5 * iqr
+
+        valid_rows = np.all(
+            (values >= min_valid) & (values <= max_valid),
+            axis=1
+        )
+        self.df = self.df.iloc[valid_rows]
 
     def drop_columns(self):
         """ Drop specified column(s) from the dataframe.
         """
-        columns = self.cfg.get("drop_col")
+        columns = self.spec.drop_col
         if not columns:
             return
 
         self.logger.info(f"dropping columns form the dataframe {columns=}")
+        self.df_changed = True
+        self._ops_ran += 1
+        existing = [col for col in columns if col in self.df.columns]
         for col in columns:
-            try:
-                self.df.drop(labels=col, axis="columns", inplace=True)
-            except KeyError as e:
-                self.logger.warning(
-                    f"column {col!r} not in the dataframe - {e}")
+            if col not in existing:
+                self.logger.warning(f"column {col!r} not in the dataframe")
+        if existing:
+            self.df.drop(columns=existing, inplace=True)
 
     def __repr__(self) -> str:
         return f"CleanerCSV(config_file={self.cfg_file!r})"
 
     def __str__(self) -> str:
-        return "\n".join([f"{i}: {self.cfg.get(i)}" for i in self.cfg.keys()])
+        return "\n".join(
+            [f"{f.name}: {getattr(self.spec, f.name)}" for f in fields(Spec)]
+        )
@@ -1,4 +1,5 @@
 from pathlib import Path
+from functools import lru_cache
 import json
 from PyQt6.QtWidgets import (
     QWidget,
@@ -13,8 +14,33 @@ from PyQt6.QtWidgets import (
     QMessageBox
 )
 from PyQt6.QtCore import (
-    Qt
+    Qt,
+    QTimer
 )
+from data_cleaner import json_dumps, json_loads
+
+# delay after the last keystroke before the editor state is updated
+TYPING_DEBOUNCE_MS = 200
+# size policies of the fixed width buttons and the stretching hint label
+POLICY_FIXED = QSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
+POLICY_EXPANDING = QSizePolicy(
+    QSizePolicy.Policy.Expanding,
+    QSizePolicy.Policy.Fixed
+)
+
+
+@lru_cache(maxsize=1)
+def parse_specs(text: str) -> tuple:
+    """ Parses the specs text, remembering the last result.
+
+    Returns:
+        data: the parsed JSON, or the unchanged text if it is not valid
+        is_json (bool): if true, data is the parsed JSON
+    """
+    try:
+        return json_loads(text), True
+    except json.JSONDecodeError:
+        return text, False
 
 
 class SpecsEditor(QWidget):
@@ -27,6 +53,10 @@ class SpecsEditor(QWidget):
         self.p_t_index = p_t_index
         self.text_editor = QTextEdit(self)
         self.text_editor.setPlainText("No specs file loaded.")
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(TYPING_DEBOUNCE_MS)
+        self._debounce.timeout.connect(self._do_rename)
         self.text_editor.textChanged.connect(self.on_text_changed)
         self.setup_ui()
 
@@ -38,13 +68,13 @@ class SpecsEditor(QWidget):
         buttons_wgt_layout.setAlignment(Qt.AlignmentFlag.AlignLeft)
 
         load_button = QPushButton("Load", self)
-        load_button.sizePolicy().setHorizontalPolicy(QSizePolicy.Policy.Fixed)
+        load_button.setSizePolicy(POLICY_FIXED)
         load_button.setFixedWidth(100)
         load_button.clicked.connect(self.on_load_file)
         buttons_wgt_layout.addWidget(load_button)
 
         save_button = QPushButton("Save", self)
-        save_button.sizePolicy().setHorizontalPolicy(QSizePolicy.Policy.Fixed)
+        save_button.setSizePolicy(POLICY_FIXED)
         save_button.setFixedWidth(100)
         save_button.clicked.connect(self.on_save_file)
         buttons_wgt_layout.addWidget(save_button)
@@ -52,9 +82,7 @@ class SpecsEditor(QWidget):
         h = ("Note: The edited file is not auto-loaded in the main app. "
              "Use the \"Load specs\" button once saved.")
         hint_label = QLabel(h, self)
-        hint_label.sizePolicy().setHorizontalPolicy(
-            QSizePolicy.Policy.Expanding
-        )
+        hint_label.setSizePolicy(POLICY_EXPANDING)
         buttons_wgt_layout.addWidget(hint_label)
 
         main_layout = QVBoxLayout(self)
@@ -64,11 +92,6 @@ class SpecsEditor(QWidget):
     def on_save_file(self):
         """ Event action for clikcing the save button.
         """
-        try:
-            self.text_editor.textChanged.disconnect()
-        except TypeError:
-            pass
-
         save_data, is_json, do_save = self.check_json()
         if not do_save:
             return
@@ -83,17 +106,15 @@ class SpecsEditor(QWidget):
             try:
                 with open(file_path, "w", encoding="utf-8") as file:
                     if is_json:
-                        json.dump(
-                            save_data, file, indent=4,
-                            ensure_ascii=False
-                        )
+                        file.write(json_dumps(save_data))
                     else:
                         file.write(save_data)
+                # the saved text includes any edit still pending a rename
+                self._debounce.stop()
                 self.parent_tab.setTabText(
                     self.p_t_index,
                     file_path.split("/")[-1]
                 )
-                self.text_editor.textChanged.connect(self.on_text_changed)
             except IOError:
                 self.parent_tab.setTabText(
                     self.p_t_index,
@@ -108,15 +129,8 @@ class SpecsEditor(QWidget):
             is_json (bool): if true, save_data is a valid json
             do_save (bool): confirmation if bad data should be saved
         """
-        text = self.text_editor.toPlainText()
-        try:
-            save_data = json.loads(self.text_editor.toPlainText())
-            is_json = True
-            do_save = True
-        except json.JSONDecodeError:
-            save_data = text
-            is_json = False
-            do_save = False
+        save_data, is_json = parse_specs(self.text_editor.toPlainText())
+        do_save = is_json
 
         if not is_json:
             response = QMessageBox.question(
@@ -146,30 +160,30 @@ class SpecsEditor(QWidget):
     def load_file(self, filename: str):
         """ Loads the specified file into the editor
         """
-        try:
-            self.text_editor.textChanged.disconnect()
-        except TypeError:
-            pass
         try:
             with open(filename, "r", encoding="utf-8") as file:
                 specs_text = file.read()
         except IOError:
             specs_text = "No specs file loaded."
         self.text_editor.setPlainText(specs_text)
+        # loading is not an edit
+        self._debounce.stop()
         self.parent_tab.setTabText(
             self.p_t_index,
             filename.split("/")[-1]
         )
-        self.text_editor.textChanged.connect(self.on_text_changed)
 
     def on_text_changed(self):
         """ Event action for typing in the editor.
+
+        Restarts the debounce timer, the tab is renamed once typing pauses.
+        """
+        self._debounce.start()
+
+    def _do_rename(self):
+        """ Marks the editor content as unsaved.
         """
         self.parent_tab.setTabText(
             self.p_t_index,
             "Unsaved JSON"
         )
-        try:
-            self.text_editor.textChanged.disconnect()
-        except TypeError:
-            pass
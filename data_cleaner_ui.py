@@ -1,4 +1,7 @@
+from functools import partial
 from pathlib import Path
+from urllib.parse import quote
+import json
 from typing import Callable
 from PyQt6.QtWidgets import (
     QMainWindow,
@@ -10,56 +13,128 @@ from PyQt6.QtWidgets import (
     QLabel,
     QSizePolicy,
     QFileDialog,
-    QMessageBox
+    QMessageBox,
+    QProgressBar
 )
 from PyQt6.QtWebEngineWidgets import QWebEngineView
+from PyQt6.QtWebEngineCore import (
+    QWebEnginePage,
+    QWebEngineProfile,
+    QWebEngineScript,
+    QWebEngineSettings
+)
 from PyQt6.QtCore import (
     Qt,
     QUrl,
-    QThread,
+    QObject,
+    QRunnable,
+    QThreadPool,
+    QSemaphore,
     pyqtSignal,
     QSettings
 )
 from data_cleaner import CleanerCSV
 from data_cleaner_spec_editor import SpecsEditor
 
-BASE_DIR = Path(__name__).parent.absolute()
-INI_FILE_NAME = (BASE_DIR / "settings.ini").__str__()
+BASE_DIR = Path(__file__).resolve().parent
+INI_FILE_NAME = str(BASE_DIR / "settings.ini")
+# placeholder pages to preload into the browser widgets
+# the empty page is served inline so the browsers need not open the file
+URL_EMPTY = QUrl(
+    "data:text/html;charset=utf-8,"
+    + quote((BASE_DIR / "empty_page.html").read_text(encoding="utf-8"))
+)
+URL_README = QUrl.fromLocalFile(str(BASE_DIR / "readme_page.html"))
+# empty page the log file is written into, see refresh_log
+URL_LOG = QUrl(
+    "data:text/html;charset=utf-8,"
+    + quote('<pre style="white-space: pre-wrap"></pre>')
+)
 BUTTONS_WIDTH = 150
+# size policies of the fixed width buttons and the stretching labels
+POLICY_FIXED = QSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
+POLICY_EXPANDING = QSizePolicy(
+    QSizePolicy.Policy.Expanding,
+    QSizePolicy.Policy.Fixed
+)
+# worker threads for the long running tasks, the cleaning tasks need two
+# to write the clean data while profiling it
+TASK_THREADS = 2
 MINIMUM_WINDOW = (800, 600)
+# tab indices of the browser widgets
+TAB_CLEAN = 2
+TAB_SOURCE = 3
+TAB_LOG = 4
+# appends text to the log page, and empties it
+JS_LOG_APPEND = (
+    "document.querySelector('pre').insertAdjacentText('beforeend', {});"
+    "window.scrollTo(0, document.body.scrollHeight);"
+)
+JS_LOG_CLEAR = "document.querySelector('pre').textContent = '';"
 
 
 class CleanerCSVWindow(QMainWindow):
     """ GUI class for the CleanerCSV app.
     """
+    # event triggered by the long tasks on reaching a new stage
+    task_progress = pyqtSignal(str)
+
     def __init__(self):
         super().__init__()
 
         self.setWindowTitle("Cleaner CSV")
         self.setMinimumSize(*MINIMUM_WINDOW)
-        geometry = QSettings(
-            INI_FILE_NAME,
-            QSettings.Format.IniFormat
-        ).value("geometry")
+        self._settings = QSettings(INI_FILE_NAME, QSettings.Format.IniFormat)
+        geometry = self._settings.value("geometry")
         if geometry is not None:
             self.restoreGeometry(geometry)
         else:
             self.setGeometry(100, 100, *MINIMUM_WINDOW)
 
         self.tabs_widget = QTabWidget(self)
+        # off the record profile shared by all browsers, a child of the tabs
+        # so it outlives the pages using it
+        self._web_profile = self.make_web_profile(self.tabs_widget)
         self.cleaner = None
-        self.long_task_thread = None
+        self.long_task = None
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(TASK_THREADS)
+        # browsers by tab index, and the tabs still waiting for theirs
+        self._browsers = {}
+        self._pending_browsers = {}
+        # log file has lines the log page does not show yet
+        self._log_dirty = False
+        # bytes of the log file written into the log page, None until the
+        # page has loaded
+        self._log_pos = None
 
         (
             self.spec_load_button,
             self.cleaner_launch_button,
             self.specs_file_label,
             self.status_label,
-            self.browser_specs,
-            self.browser_clean,
-            self.browser_source,
-            self.browser_log
+            self.progress_bar,
+            self.browser_specs
         ) = self.setup_ui()
+        self.task_progress.connect(self.set_status)
+
+    @property
+    def browser_clean(self) -> QWebEngineView:
+        """ Browser of the cleaned data profile tab.
+        """
+        return self.get_browser(TAB_CLEAN)
+
+    @property
+    def browser_source(self) -> QWebEngineView:
+        """ Browser of the source data profile tab.
+        """
+        return self.get_browser(TAB_SOURCE)
+
+    @property
+    def browser_log(self) -> QWebEngineView:
+        """ Browser of the logfile tab.
+        """
+        return self.get_browser(TAB_LOG)
 
     def setup_ui(self):
         """ Creates the main GUI window.
@@ -83,28 +158,25 @@ class CleanerCSVWindow(QMainWindow):
         control_wgt_layout.addWidget(spec_load_button)
         # label showing the currently selected spec files name
         specs_file_label = QLabel("No specs file loaded", self)
-        specs_file_label.sizePolicy().setHorizontalPolicy(
-            QSizePolicy.Policy.Expanding
-        )
+        specs_file_label.setSizePolicy(POLICY_EXPANDING)
         control_wgt_layout.addWidget(specs_file_label)
 
+        # status line with a busy indicator for the long running tasks
+        status_wgt = QWidget(self)
+        status_wgt_layout = QHBoxLayout(status_wgt)
         status_label = QLabel("", self)
-        status_label.sizePolicy().setHorizontalPolicy(
-            QSizePolicy.Policy.Expanding
-        )
+        status_label.setSizePolicy(POLICY_EXPANDING)
+        status_wgt_layout.addWidget(status_label)
+        progress_bar = QProgressBar(self)
+        progress_bar.setRange(0, 0)
+        progress_bar.setFixedWidth(BUTTONS_WIDTH)
+        progress_bar.setVisible(False)
+        status_wgt_layout.addWidget(progress_bar)
 
         # tabbed info widgets
-        # placeholder pages to preload into the browser widgets
-        url_placeholder = QUrl.fromLocalFile(
-            (BASE_DIR / "empty_page.html").__str__()
-        )
-        url_readme = QUrl.fromLocalFile(
-            (BASE_DIR / "readme_page.html").__str__()
-        )
-
         # tab 0 intro message
         self.make_browser_widget(
-            url_readme,
+            URL_README,
             tab_title="Introduction"
         )
 
@@ -113,31 +185,38 @@ class CleanerCSVWindow(QMainWindow):
         browser_specs = SpecsEditor(self.tabs_widget, 1)
         self.tabs_widget.addTab(browser_specs, "No specs loaded")
 
+        # the browsers of the other tabs are created on first use
         # tab 2 cleaned profile view
-        browser_clean = self.make_browser_widget(
-            url_placeholder,
-            tab_title="Current profile"
+        self.make_browser_widget(
+            URL_EMPTY,
+            tab_title="Current profile",
+            javascript=True,
+            lazy=True
         )
 
         # tab 3 source profile view
-        browser_source = self.make_browser_widget(
-            url_placeholder,
-            tab_title="Source profile"
+        self.make_browser_widget(
+            URL_EMPTY,
+            tab_title="Source profile",
+            javascript=True,
+            lazy=True
         )
 
         # tab 4 log viewer
-        browser_log = self.make_browser_widget(
-            url_placeholder,
-            tab_title="Logfile"
+        self.make_browser_widget(
+            URL_EMPTY,
+            tab_title="Logfile",
+            lazy=True
         )
 
         # Main Layout
         main_layout = QVBoxLayout()
         main_layout.addWidget(control_wgt)
         main_layout.addWidget(self.tabs_widget)
-        main_layout.addWidget(status_label)
+        main_layout.addWidget(status_wgt)
 
         self.tabs_widget.tabBarClicked.connect(self.on_tab_clicked)
+        self.tabs_widget.currentChanged.connect(self.on_tab_changed)
 
         central_widget = QWidget(self)
         central_widget.setLayout(main_layout)
@@ -148,40 +227,125 @@ class CleanerCSVWindow(QMainWindow):
             cleaner_launch_button,
             specs_file_label,
             status_label,
-            browser_specs,
-            browser_clean,
-            browser_source,
-            browser_log
+            progress_bar,
+            browser_specs
         )
 
     def closeEvent(self, event):
         """ Saves window geometry data when the GUI is terminated.
         """
-        QSettings(
-            INI_FILE_NAME,
-            QSettings.Format.IniFormat
-        ).setValue("geometry", self.saveGeometry())
+        self._settings.setValue("geometry", self.saveGeometry())
+        self._settings.sync()
         event.accept()
 
     def make_browser_widget(
             self,
             preload_url: QUrl,
-            tab_title: str
-    ) -> QWebEngineView:
+            tab_title: str,
+            javascript: bool = False,
+            lazy: bool = False
+    ) -> QWebEngineView | None:
         """ Assembles and returns a Qt html browser widget.
 
         Args:
             preload_url (QUrl): The page to load in the widget
             tab_title: Tab name as displaed on the tab-bar handle
+            javascript: If true, the page may run scripts
+            lazy: If true, only the tab is created and the browser is
+                left to get_browser
         """
         wgt = QWidget()
         layout = QVBoxLayout(wgt)
+        index = self.tabs_widget.addTab(wgt, tab_title)
+        if lazy:
+            self._pending_browsers[index] = (layout, preload_url, javascript)
+            return None
+        return self.make_browser(layout, preload_url, javascript)
+
+    def make_browser(
+            self,
+            layout: QVBoxLayout,
+            preload_url: QUrl,
+            javascript: bool = False
+    ) -> QWebEngineView:
+        """ Creates a browser in the given tab layout.
+
+        The browser's page uses the shared web profile. Only the profile
+        pages need scripts, for their interactive elements.
+
+        Args:
+            layout (QVBoxLayout): The layout of the tab page
+            preload_url (QUrl): The page to load in the widget
+            javascript: If true, the page may run scripts
+        """
         browser = QWebEngineView()
-        browser.page().setUrl(preload_url)
+        page = QWebEnginePage(self._web_profile, browser)
+        browser.setPage(page)
+        page.settings().setAttribute(
+            QWebEngineSettings.WebAttribute.JavascriptEnabled,
+            javascript
+        )
+        page.setUrl(preload_url)
         layout.addWidget(browser)
-        self.tabs_widget.addTab(wgt, tab_title)
         return browser
 
+    @staticmethod
+    def make_web_profile(parent: QObject) -> QWebEngineProfile:
+        """ Creates the off the record web profile for the browsers.
+
+        Caches are kept in memory only and features not needed to show the
+        profiles and the log are turned off.
+
+        Args:
+            parent (QObject): Owner of the profile, must be deleted after
+                the pages using it
+        """
+        profile = QWebEngineProfile(parent)
+        profile.setHttpCacheType(
+            QWebEngineProfile.HttpCacheType.MemoryHttpCache
+        )
+        profile.setPersistentCookiesPolicy(
+            QWebEngineProfile.PersistentCookiesPolicy.NoPersistentCookies
+        )
+        settings = profile.settings()
+        attribute = QWebEngineSettings.WebAttribute
+        settings.setAttribute(attribute.PluginsEnabled, False)
+        settings.setAttribute(attribute.WebGLEnabled, False)
+        settings.setAttribute(attribute.LocalStorageEnabled, False)
+        return profile
+
+    @staticmethod
+    def set_browser_url(browser: QWebEngineView, url: QUrl):
+        """ Shows the given page in a browser.
+
+        A page already on display is reloaded instead, as its file has
+        been rewritten.
+
+        Args:
+            browser (QWebEngineView): The browser to update
+            url (QUrl): The page to show
+        """
+        if browser.page().url() != url:
+            browser.page().setUrl(url)
+        else:
+            browser.reload()
+
+    def get_browser(self, index: int) -> QWebEngineView:
+        """ Returns the browser of a tab, creating it on first access.
+
+        Args:
+            index: The tab index
+        """
+        if index in self._pending_browsers:
+            self._browsers[index] = self.make_browser(
+                *self._pending_browsers.pop(index)
+            )
+            if index == TAB_LOG:
+                self._browsers[index].loadFinished.connect(
+                    self.on_log_loaded
+                )
+        return self._browsers[index]
+
     def make_button(
             self,
             button_label: str
@@ -189,7 +353,7 @@ class CleanerCSVWindow(QMainWindow):
         """ Makes a button.
         """
         button = QPushButton(button_label, self)
-        button.sizePolicy().setHorizontalPolicy(QSizePolicy.Policy.Fixed)
+        button.setSizePolicy(POLICY_FIXED)
         button.setFixedWidth(BUTTONS_WIDTH)
         return button
 
@@ -199,50 +363,111 @@ class CleanerCSVWindow(QMainWindow):
             Runs the QFileDialog and sends the selected file to
             concerned methods
         """
+        # skip the icon and symlink lookups for every directory entry
         full_file_name, _ = QFileDialog.getOpenFileName(
             self,
-            "Save specs as json",
-            "",
-            "JSON files (*.json);;Text files (*.txt);;All files (*)"
+            "Load specs json",
+            self._settings.value("last_spec_dir", "", str),
+            "JSON files (*.json);;Text files (*.txt);;All files (*)",
+            options=(
+                QFileDialog.Option.DontUseCustomDirectoryIcons
+                | QFileDialog.Option.DontResolveSymlinks
+            )
         )
         # full_file_name, _ = QFileDialog.getOpenFileName()
         if not full_file_name:
             return
+        self._settings.setValue(
+            "last_spec_dir",
+            str(Path(full_file_name).parent)
+        )
         self.attach_cleaner(full_file_name)
 
     def toggle_buttons_enabled(self, set_to: bool):
         """ Locks or unlocks interface buttons
+
+        The busy indicator is shown while the buttons are locked. Cleaning
+        stays locked while no cleaner is attached.
         """
         self.spec_load_button.setEnabled(set_to)
-        self.cleaner_launch_button.setEnabled(set_to)
+        self.cleaner_launch_button.setEnabled(
+            set_to and self.cleaner is not None
+        )
+        self.progress_bar.setVisible(not set_to)
+
+    def set_status(self, status: str):
+        """ Shows a status message, leaving the label alone if unchanged.
+
+        Args:
+            status: The message to show
+        """
+        if self.status_label.text() != status:
+            self.status_label.setText(status)
 
     def attach_cleaner(self, full_file_name: str):
         """ Creates a cleaner instance from the given specs json file.
 
         Will load the spec, the specified source file and launch the
         Profiler for the source data, sending the results to the respective
-        interface elements.
+        interface elements. Loading runs in the thread pool, the interface
+        is updated in on_cleaner_loaded.
 
         Args:
             full_file_name: Name of the specs file to use
         """
+        if self.is_task_running():
+            return
         self.toggle_buttons_enabled(False)
         if self.cleaner:
             self.cleaner.release_files()
             self.cleaner = None
-        self.cleaner = CleanerCSV(Path(full_file_name))
-        loaded_spec = self.cleaner.cfg_file.__str__()
-        self.specs_file_label.setText(loaded_spec)
 
-        # update the spec editor
-        self.browser_specs.load_file(full_file_name)
-
-        # update the log browser
-        log_path = str(self.cleaner.logfile.absolute())
-        self.browser_log.page().setUrl(
-            QUrl.fromLocalFile(log_path)
+        self.set_status("Loading specs and source data")
+        self.start_long_task(
+            LongTask(
+                info="Specs loader",
+                task=CleanerCSV,
+                config_file=Path(full_file_name)
+            ),
+            partial(self.on_cleaner_loaded, full_file_name)
         )
 
+    def on_cleaner_loaded(self, full_file_name: str, result, cleaner):
+        """ Event action to launch when the cleaner instance is created.
+
+        Args:
+            full_file_name: Name of the requested specs file
+            result: The task's completion message
+            cleaner (CleanerCSV): The created cleaner instance, None if
+                loading failed
+        """
+        self.long_task = None
+        if cleaner is None:
+            # the log on display belonged to the released cleaner
+            self._log_dirty = False
+            self.set_status(result)
+            self.toggle_buttons_enabled(True)
+            return
+        self.cleaner = cleaner
+        # repaint once after all the widgets are updated
+        self.setUpdatesEnabled(False)
+        try:
+            self.specs_file_label.setText(str(self.cleaner.cfg_file))
+
+            # update the spec editor
+            self.browser_specs.load_file(full_file_name)
+
+            # update the log browser, the new log is written into an
+            # empty log page
+            if self._log_pos is not None:
+                self.run_log_script(JS_LOG_CLEAR)
+                self._log_pos = 0
+            else:
+                self.browser_log.page().setUrl(URL_LOG)
+            self.mark_log_dirty()
+        finally:
+            self.setUpdatesEnabled(True)
+
         # chance to bail out on bad specs
         if Path(full_file_name) != self.cleaner.cfg_file:
             response = QMessageBox.question(
@@ -252,98 +477,252 @@ class CleanerCSVWindow(QMainWindow):
                 QMessageBox.StandardButton.No | QMessageBox.StandardButton.Yes
             )
             if response != QMessageBox.StandardButton.Yes:
+                self.set_status(result)
                 self.toggle_buttons_enabled(True)
                 return
 
         # run profile on source data
-        self.status_label.setText("Profiling input data. "
-                                  "This might take a minute")
-        # delete (possible) previous connections before updating the task
-        if self.long_task_thread:
-            self.long_task_thread.long_task_done.disconnect()
-        self.long_task_thread = LongTaskThread(
-            info="Source data profiler",
-            task=self.cleaner.html_profile
-        )
-        self.long_task_thread.long_task_done.connect(
+        self.set_status("Profiling input data. "
+                        "This might take a minute")
+        self.start_long_task(
+            LongTask(
+                info="Source data profiler",
+                task=self.cleaner.html_profile
+            ),
             self.on_long_task_input_profiler
         )
-        self.long_task_thread.start()
 
     def cleaning_tasks(self):
         """ Helper method for launching the cleaning process.
+
+        The clean data is written in a second pool thread while the output
+        profile is created.
+
+        Returns:
+            str: The output profile file, empty if none was created
+
+        Raises:
+            Exception: Any error raised while writing the clean data
         """
         self.cleaner.run_all_cleaners()
-        self.cleaner.html_profile()
-        self.cleaner.csv_write_clean()
+        self.task_progress.emit("Profiling and writing clean data. "
+                                "This might take a minute")
+        written = QSemaphore()
+        errors = []
+
+        def write():
+            try:
+                self.cleaner.csv_write_clean()
+            except Exception as e:
+                errors.append(e)
+            finally:
+                written.release()
+
+        self._pool.start(write)
+        try:
+            profile = self.cleaner.html_profile()
+            self.task_progress.emit("Writing clean data")
+        finally:
+            # the window stays locked until the writer is done with the data
+            written.acquire()
+        if errors:
+            raise errors[0]
+        return profile
 
     def on_cleaner_launch_click(self):
         """ Launches the cleaning and output profiling tasks.
 
-        The tasks can take some time and will be launched as a new thread.
+        The tasks can take some time and will be run in the thread pool.
         """
+        if self.is_task_running() or self.cleaner is None:
+            return
         self.toggle_buttons_enabled(False)
 
-        self.status_label.setText("Processing dataframe. "
-                                  "This might take a minute")
-        if self.long_task_thread:
-            self.long_task_thread.long_task_done.disconnect()
+        self.set_status("Processing dataframe. "
+                        "This might take a minute")
+        self.start_long_task(
+            LongTask(
+                info="Cleaning Tasks",
+                task=self.cleaning_tasks
+            ),
+            self.on_long_task_cleaning
+        )
 
-        self.long_task_thread = LongTaskThread(
-            info="Cleaning Tasks",
-            task=self.cleaning_tasks
+    def is_task_running(self) -> bool:
+        """ Checks if a long task has been started and not yet finished.
+        """
+        return self.long_task is not None
+
+    def start_long_task(self, task: "LongTask", on_done: Callable):
+        """ Runs a long task in the thread pool.
+
+        Args:
+            task (LongTask): The task to run
+            on_done: Slot receiving the task's completion message and
+                the task's return value
+        """
+        self.long_task = task
+        task.signals.long_task_error.connect(
+            self.on_long_task_error,
+            Qt.ConnectionType.QueuedConnection
         )
-        self.long_task_thread.long_task_done.connect(
-            self.on_long_task_cleaning
+        task.signals.long_task_done.connect(
+            on_done,
+            Qt.ConnectionType.QueuedConnection
         )
-        self.long_task_thread.start()
+        self._pool.start(task)
+
+    def on_long_task_error(self, message: str):
+        """ Event action to launch when a long task raised an error.
+        """
+        QMessageBox.warning(self, "Task failed", message)
 
-    def on_long_task_cleaning(self, result):
+    def on_long_task_cleaning(self, result, profile=None):
         """ Event action to launch when after pass of cleaning has finished.
+
+        Args:
+            result: The task's completion message
+            profile: The output profile file, None if the task failed
         """
-        self.status_label.setText(result)
-        self.toggle_buttons_enabled(True)
-        profile_url = self.cleaner.output_profile.absolute().__str__()
-        profile_url = QUrl.fromLocalFile(profile_url)
-        self.browser_clean.page().setUrl(profile_url)
-        self.browser_log.reload()
-
-    def on_long_task_input_profiler(self, result):
+        self.long_task = None
+        self.setUpdatesEnabled(False)
+        try:
+            self.set_status(result)
+            self.toggle_buttons_enabled(True)
+            if profile:
+                profile_url = QUrl.fromLocalFile(profile)
+                self.set_browser_url(self.browser_clean, profile_url)
+            self.mark_log_dirty()
+        finally:
+            self.setUpdatesEnabled(True)
+
+    def on_long_task_input_profiler(self, result, profile=None):
         """ Event action to launch when the input data processing is finished.
+
+        Args:
+            result: The task's completion message
+            profile: The input profile file, None if the task failed
         """
-        self.status_label.setText(result)
-        self.toggle_buttons_enabled(True)
-        profile_url = self.cleaner.input_profile.absolute().__str__()
-        profile_url = QUrl.fromLocalFile(profile_url)
-        self.browser_source.page().setUrl(profile_url)
-        self.browser_log.reload()
+        self.long_task = None
+        self.setUpdatesEnabled(False)
+        try:
+            self.set_status(result)
+            self.toggle_buttons_enabled(True)
+            if profile:
+                profile_url = QUrl.fromLocalFile(profile)
+                self.set_browser_url(self.browser_source, profile_url)
+            self.mark_log_dirty()
+        finally:
+            self.setUpdatesEnabled(True)
 
     def on_tab_clicked(self, index):
         """ Event action for clicking into the tab selection element.
 
-        Updates the log display tab. The other tabs will update when their
-        appropriate procesesses run.
+        Updates the log display tab if the log has changed. The other tabs
+        will update when their appropriate procesesses run.
+        """
+        if index == TAB_LOG:
+            self.refresh_log()
+
+    def mark_log_dirty(self):
+        """ Flags the log display as outdated after a task wrote to the log.
+
+        The log is updated right away only if its tab is on display.
+        """
+        self._log_dirty = True
+        if self.tabs_widget.currentIndex() == TAB_LOG:
+            self.refresh_log()
+
+    def refresh_log(self):
+        """ Updates the log display if the log has changed since.
+
+        The log page only shows what has been written into it. Complete
+        lines added to the log file are appended, and the page is emptied
+        if the log file has been started over.
         """
-        if index == 4:
-            self.browser_log.reload()
+        if not self._log_dirty or self.cleaner is None:
+            return
+        if self._log_pos is None:
+            # on_log_loaded catches up once the page is ready
+            return
+        self._log_dirty = False
+        try:
+            with open(self.cleaner.logfile, "rb") as f:
+                size = f.seek(0, 2)
+                if size < self._log_pos:
+                    self.run_log_script(JS_LOG_CLEAR)
+                    self._log_pos = 0
+                f.seek(self._log_pos)
+                added = f.read()
+        except OSError:
+            return
+        # a line still being written is left for the next update
+        added = added[:added.rfind(b"\n") + 1]
+        if not added:
+            return
+        self._log_pos += len(added)
+        self.run_log_script(
+            JS_LOG_APPEND.format(json.dumps(added.decode(errors="replace")))
+        )
 
+    def run_log_script(self, script: str):
+        """ Runs a script on the log page.
 
-class LongTaskThread(QThread):
-    """ Threaded worker class for the profiling tasks
+        The application world runs scripts even with JavaScript disabled.
+        """
+        self.browser_log.page().runJavaScript(
+            script,
+            QWebEngineScript.ScriptWorldId.ApplicationWorld
+        )
+
+    def on_log_loaded(self, ok: bool):
+        """ Event action for the log browser finishing a page load.
+
+        Writes the whole log into a freshly loaded log page.
+        """
+        if not ok or self.browser_log.url() != URL_LOG:
+            return
+        self._log_pos = 0
+        self._log_dirty = True
+        self.refresh_log()
+
+    def on_tab_changed(self, index):
+        """ Event action for switching to a tab.
+
+        Creates the tab's browser if it has not been used yet.
+        """
+        if index in self._pending_browsers:
+            self.get_browser(index)
+
+
+class LongTaskSignals(QObject):
+    """ Signals of a LongTask, QRunnable can not emit signals itself.
     """
-    # event triggered on task completion
-    long_task_done = pyqtSignal(str)
+    # event triggered on task completion, carries the task's return value
+    long_task_done = pyqtSignal(str, object)
+    # event triggered before completion if the task raised an error
+    long_task_error = pyqtSignal(str)
 
-    def __init__(self, info: str, task: Callable, **task_kwargs: dict):
+
+class LongTask(QRunnable):
+    """ Thread pool worker class for the profiling tasks
+    """
+    def __init__(self, info: str, task: Callable, **task_kwargs):
         super().__init__()
+        self.signals = LongTaskSignals()
         self.info = info
         self.task = task
         self.task_kwargs = task_kwargs
-        self.has_kwargs = False if not task_kwargs else True
 
     def run(self):
-        if self.has_kwargs:
-            self.task(**self.task_kwargs)
-        else:
-            self.task()
-        self.long_task_done.emit(f"Task completed: {self.info}")
+        message = f"Task failed: {self.info}"
+        value = None
+        try:
+            value = self.task(**self.task_kwargs)
+            message = f"Task completed: {self.info}"
+        except Exception as e:
+            message = f"Task failed: {self.info}: {e!r}"
+            self.signals.long_task_error.emit(message)
+        finally:
+            # always report back, the window waits for it to unlock
+            self.signals.long_task_done.emit(message, value)